@@ -3,6 +3,7 @@ import pandas as pd
 from datetime import datetime
 import os
 from streamlit_option_menu import option_menu
+from search_index import load_sheet, search_box
 
 EXCEL_FILE = r"data/payment_requests.xlsx"
 
@@ -146,8 +147,8 @@ def bl_release():
 def display_report():
     st.subheader("Payment Request Report")
     if os.path.exists(EXCEL_FILE):
-        df = pd.read_excel(EXCEL_FILE)
-        st.dataframe(df)
+        df, version = load_sheet(EXCEL_FILE)
+        st.dataframe(search_box(df, version, key="ops_report"))
     else:
         st.info("No data available.")
 
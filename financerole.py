@@ -4,9 +4,86 @@ from datetime import datetime, timedelta
 import os
 from io import BytesIO
 from streamlit_option_menu import option_menu
+from search_index import load_sheet, search_box
 
 EXCEL_FILE = r"data/payment_requests.xlsx"
 
+def payment_status(mbl_rows, today):
+    """Reconcile the rows of one MBL and return (status text, payment updated date).
+
+    Kept free of Streamlit so it can be exercised headless.
+    """
+    total_expected_inr = 0
+    total_expected_usd = 0
+    total_paid_inr = 0
+    usd_payment = False
+    status = ''
+    for _, row in mbl_rows.iterrows():
+        status = row['Status']
+        if pd.notna(row['SWIFT Certificate Link']) and row['SWIFT Certificate Link'].strip() != '':
+            usd_payment = True
+
+        if row['Currency'] == 'INR':
+            amt = pd.to_numeric(row['Amount'], errors='coerce')
+            amt = 0 if pd.isna(amt) else amt
+            total_expected_inr += amt
+
+        gst_amt = pd.to_numeric(
+            row.get('GST Amount in INR (If Freight in USD and GST in INR)', 0),
+            errors='coerce'
+        )
+        gst_amt = 0 if pd.isna(gst_amt) else gst_amt
+        total_expected_inr += gst_amt
+
+        if row['Currency'] == 'USD':
+            samt = pd.to_numeric(row['Amount'], errors='coerce')
+            samt = 0 if pd.isna(samt) else samt
+            total_expected_usd += samt
+
+        if row['Amount Paid Currency'] == 'INR':
+            total_paid_inr += pd.to_numeric(row['Amount Paid'], errors='coerce') or 0
+
+    # Determine payment status
+    if total_paid_inr == total_expected_inr:
+        if total_expected_usd > 0 and not usd_payment:
+            return 'USD Pending', today
+        return 'Paid', today
+    elif (total_paid_inr < total_expected_inr) and total_paid_inr!=0:
+        difference = round(total_expected_inr - total_paid_inr, 2)
+        if total_expected_usd > 0 and not usd_payment:
+            return f'Part Payment: ₹{difference} Pending | USD Pending', today
+        return f'Part Payment: ₹{difference} Pending', today
+    elif total_paid_inr > total_expected_inr:
+        return 'Over Paid: Check Amount', today
+    return status, None
+
+def apply_payments(df, edited_df, editable_columns, today):
+    """Write the edited payment rows back into df and restatus each MBL."""
+    for mbl in edited_df['MBL #'].unique():
+        mbl_rows = edited_df[edited_df['MBL #'] == mbl]
+
+        for _, row in mbl_rows.iterrows():
+            df.loc[
+                (df['MBL #'] == row['MBL #']) &
+                (df['Currency'] == row['Currency']) &
+                (df['Amount'] == row['Amount']),
+                'IRN Invoice'
+            ] = ('Required' if row.get('IRN Required?', False) else None)
+
+            # Update payment details in original DataFrame
+            df.loc[
+                (df['MBL #'] == row['MBL #']) &
+                (df['Currency'] == row['Currency']) &
+                (df['Amount'] == row['Amount']),
+                editable_columns
+            ] = row[editable_columns].values
+
+        status_text, payment_date = payment_status(mbl_rows, today)
+
+        # Apply status to all rows of this MBL
+        df.loc[df['MBL #'] == mbl, 'Status'] = status_text
+        df.loc[df['MBL #'] == mbl,'Payment Updated Date'] = payment_date
+
 def pay_make():
     if os.path.exists(EXCEL_FILE):
         df = pd.read_excel(EXCEL_FILE)
@@ -85,91 +162,7 @@ def pay_make():
         if st.button("Update"):
             today = datetime.today().date()
 
-            for mbl in edited_df['MBL #'].unique():
-                mbl_rows = edited_df[edited_df['MBL #'] == mbl]
-
-                total_expected_inr = 0
-                total_expected_usd = 0
-                total_paid_inr = 0
-                usd_payment = False
-                status = ''
-                for _, row in mbl_rows.iterrows():
-                    irn_required = row.get('IRN Required?', False)
-                    irn_value = "Required" if irn_required else ""
-                    df.loc[
-                        (df['MBL #'] == row['MBL #']) &
-                        (df['Currency'] == row['Currency']) &
-                        (df['Amount'] == row['Amount']),
-                        'IRN Invoice'
-                    ] = ('Required' if row.get('IRN Required?', False) else None)
-
-                    status = row['Status']
-                    if pd.notna(row['SWIFT Certificate Link']) and row['SWIFT Certificate Link'].strip() != '':
-                        usd_payment = True
-
-                    # Update payment details in original DataFrame
-                    df.loc[
-                        (df['MBL #'] == row['MBL #']) &
-                        (df['Currency'] == row['Currency']) &
-                        (df['Amount'] == row['Amount']),
-                        editable_columns
-                    ] = row[editable_columns].values
-
-                    if row['Currency'] == 'INR':
-                        amt = pd.to_numeric(row['Amount'], errors='coerce')
-                        amt = 0 if pd.isna(amt) else amt
-                        total_expected_inr += amt
-
-                    gst_amt = pd.to_numeric(
-                        row.get('GST Amount in INR (If Freight in USD and GST in INR)', 0),
-                        errors='coerce'
-                    )
-                    gst_amt = 0 if pd.isna(gst_amt) else gst_amt
-                    total_expected_inr += gst_amt
-
-                    if row['Currency'] == 'USD':
-                        samt = pd.to_numeric(row['Amount'], errors='coerce')
-                        samt = 0 if pd.isna(samt) else samt
-                        total_expected_usd += samt
-
-                    if row['Amount Paid Currency'] == 'INR':
-                        total_paid_inr += pd.to_numeric(row['Amount Paid'], errors='coerce') or 0
-
-                print(mbl,total_expected_inr)
-                # Determine payment status
-                if total_paid_inr == total_expected_inr:
-                    if total_expected_usd > 0:
-                        if not usd_payment:
-                            status_text = 'USD Pending'
-                            payment_date = today
-                        else:
-                            status_text = 'Paid'
-                            payment_date = today
-                    else:
-                        status_text = 'Paid'
-                        payment_date = today
-                elif (total_paid_inr < total_expected_inr) and total_paid_inr!=0:
-                    difference = round(total_expected_inr - total_paid_inr, 2)
-                    if total_expected_usd > 0:
-                        if not usd_payment:
-                            status_text = f'Part Payment: ₹{difference} Pending | USD Pending'
-                            payment_date = today
-                        else:
-                            status_text = f'Part Payment: ₹{difference} Pending'
-                            payment_date = today
-                    else:
-                        status_text = f'Part Payment: ₹{difference} Pending'
-                        payment_date = today
-                elif total_paid_inr > total_expected_inr:
-                    status_text = 'Over Paid: Check Amount'
-                    payment_date = today
-                else:
-                    status_text = status
-                    payment_date = None
-
-                # Apply status to all rows of this MBL
-                df.loc[df['MBL #'] == mbl, 'Status'] = status_text
-                df.loc[df['MBL #'] == mbl,'Payment Updated Date'] = payment_date
+            apply_payments(df, edited_df, editable_columns, today)
 
             # Format date columns
             date_columns = [
@@ -195,10 +188,10 @@ def convert_df_to_excel(df):
 
 def show_all_payments():
     if os.path.exists(EXCEL_FILE):
-        df = pd.read_excel(EXCEL_FILE)
+        df, version = load_sheet(EXCEL_FILE)
 
         st.markdown("### 📄 All Payment Records")
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        st.dataframe(search_box(df, version, key="all_payments"), use_container_width=True, hide_index=True)
 
         # Download as Excel
         download_filename = f"All_Payments_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
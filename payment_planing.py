@@ -3,15 +3,23 @@ import pandas as pd
 from datetime import datetime, timedelta
 import os
 from streamlit_option_menu import option_menu
+from search_index import load_sheet, search_box
 
 EXCEL_FILE = r"data/payment_requests.xlsx"
 
+def unscheduled_rows(df):
+    """Rows still awaiting a payment date: not paid and not already 'Pay On:'."""
+    return df[~df['Status'].isin(['Paid']) & ~df['Status'].str.startswith('Pay On:', na=False)].copy()
+
 def pay_plan():
     if os.path.exists(EXCEL_FILE):
-        ori_df = pd.read_excel(EXCEL_FILE)
+        ori_df, version = load_sheet(EXCEL_FILE)
 
-        df = ori_df.copy()
-        df = df[~df['Status'].isin(['Paid']) & ~df['Status'].str.startswith('Pay On:', na=False)]
+        # Search hits pull in every row of their MBL so the totals cover the whole MBL
+        df = search_box(
+            ori_df, version, key="pay_plan", status_filter=False,
+            group_by='MBL #', within=unscheduled_rows(ori_df)
+        ).copy()
         # Convert necessary columns
         df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce')
         df['GST Amount in INR (If Freight in USD and GST in INR)'] = pd.to_numeric(
@@ -0,0 +1,209 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import os
+import threading
+from collections import OrderedDict, defaultdict
+
+EXCEL_FILE = r"data/payment_requests.xlsx"
+
+# Columns matched by substring (trigram index) and by exact value
+NGRAM_COLUMNS = ['MBL #', 'Carrier Invoice #', 'Remarks']
+EXACT_COLUMNS = ['Carrier', 'Status']
+GRAM_SIZE = 3
+# Sheet versions whose column codes are kept for sessions still on them
+CACHED_VERSIONS = 4
+
+
+def display(series):
+    """Stripped string values with blanks for missing cells."""
+    return series.fillna('').astype(str).str.strip()
+
+
+def normalize(value):
+    return str(value).strip().upper()
+
+
+def grams(value):
+    return {value[i:i + GRAM_SIZE] for i in range(len(value) - GRAM_SIZE + 1)}
+
+
+def file_version(source=EXCEL_FILE):
+    return os.stat(source).st_mtime_ns if os.path.exists(source) else None
+
+
+def load_sheet(source=EXCEL_FILE):
+    """Read the sheet together with the version it was read at.
+
+    The mtime is taken before and after the read, and the read retried if a
+    save landed in between, so the version always describes the frame.
+    """
+    while True:
+        version = file_version(source)
+        df = pd.read_excel(source)
+        if file_version(source) == version:
+            return df, version
+
+
+def encode(df):
+    """Factorize each indexed column of df into row codes.
+
+    Returns {col: (codes, positions, labels)} where positions maps each
+    normalized distinct value to its code and labels holds the sheet value
+    shown for each exact column value.
+    """
+    encoded = {}
+    for col in NGRAM_COLUMNS + EXACT_COLUMNS:
+        shown = display(df[col]) if col in df.columns else pd.Series('', index=df.index)
+        codes, values = pd.factorize(shown.str.upper().astype(object))
+        values = values.tolist()
+        labels = []
+        if col in EXACT_COLUMNS and len(shown):
+            labels = shown.groupby(codes, sort=True).first().tolist()
+        encoded[col] = (codes, dict(zip(values, range(len(values)))), labels)
+    return encoded
+
+
+class SearchIndex:
+    """In-memory index over the distinct values of the payment sheet.
+
+    Text columns keep trigram postings from each distinct value to itself,
+    so a save only adds postings for values it introduces. Each sheet
+    version is factorized once into per-column row codes, and matches are
+    mapped back to the rows of that version with a vectorized isin.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = OrderedDict()
+        self._grams = {col: defaultdict(set) for col in NGRAM_COLUMNS}
+        self._indexed = {col: set() for col in NGRAM_COLUMNS}
+
+    def _new_postings(self, encoded):
+        """Trigram postings for the values of encoded not yet indexed.
+
+        Built without the lock; a column whose index is mostly values that
+        saves have since dropped is rebuilt from scratch instead.
+        """
+        postings = {}
+        for col in NGRAM_COLUMNS:
+            current = encoded[col][1].keys()
+            indexed = self._indexed[col]
+            rebuild = not indexed or len(indexed) > 2 * len(current) + 1000
+            values = set(current) if rebuild else current - indexed
+            grams_of = defaultdict(set)
+            for value in values:
+                for gram in grams(value):
+                    grams_of[gram].add(value)
+            postings[col] = (rebuild, values, grams_of)
+        return postings
+
+    def sync(self, df, version):
+        """Index df as version unless that version is already cached."""
+        with self._lock:
+            encoded = self._versions.get(version)
+            if encoded is not None and len(encoded['MBL #'][0]) == len(df):
+                self._versions.move_to_end(version)
+                return encoded
+
+        # Factorizing and building postings are the expensive parts; only
+        # merging them into the shared index happens under the lock
+        encoded = encode(df)
+        postings = self._new_postings(encoded)
+        with self._lock:
+            self._versions[version] = encoded
+            self._versions.move_to_end(version)
+            while len(self._versions) > CACHED_VERSIONS:
+                self._versions.popitem(last=False)
+            for col, (rebuild, values, grams_of) in postings.items():
+                if rebuild:
+                    self._grams[col], self._indexed[col] = grams_of, values
+                    continue
+                for gram, matched in grams_of.items():
+                    self._grams[col][gram] |= matched
+                self._indexed[col] |= values
+        return encoded
+
+    def options(self, df, version, col):
+        """Sheet values of an exact column, as shown in df."""
+        labels = self.sync(df, version)[col][2]
+        return sorted(label for label in labels if label)
+
+    def _match_text(self, col, query):
+        buckets = sorted((self._grams[col].get(gram, set()) for gram in grams(query)), key=len)
+        # Trigrams can match out of order, so confirm the substring itself
+        return [value for value in set.intersection(*buckets) if query in value]
+
+    def lookup(self, df, version, query='', filters=None):
+        """Return sorted row positions of df matching the query and filters.
+
+        query is matched as a substring of MBL #, Carrier Invoice # or
+        Remarks and needs at least GRAM_SIZE characters; filters maps an
+        exact column to the values to accept.
+        """
+        encoded = self.sync(df, version)
+        query = normalize(query or '')
+        mask = None
+
+        def rows(col, values):
+            codes, positions, _ = encoded[col]
+            matched = [positions[value] for value in values if value in positions]
+            return np.isin(codes, matched)
+
+        if len(query) >= GRAM_SIZE:
+            mask = np.zeros(len(df), dtype=bool)
+            for col in NGRAM_COLUMNS:
+                with self._lock:
+                    values = self._match_text(col, query)
+                mask |= rows(col, values)
+
+        for col, selected in (filters or {}).items():
+            if selected:
+                matched = rows(col, [normalize(value) for value in selected])
+                mask = matched if mask is None else mask & matched
+
+        if mask is None:
+            return np.arange(len(df))
+        return np.flatnonzero(mask)
+
+
+@st.cache_resource
+def get_search_index(source=EXCEL_FILE):
+    return SearchIndex()
+
+
+def search_box(df, version, key, source=EXCEL_FILE, status_filter=True, group_by=None, within=None):
+    """Render the search controls and return the matching rows of df.
+
+    df and version must come from load_sheet(source). group_by keeps every
+    row sharing a matched value of that column, and within (a subset of df)
+    limits both the result and the record count to the rows the page shows.
+    """
+    index = get_search_index(source)
+    shown = df if within is None else within
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        query = st.text_input("🔍 Search MBL # / Carrier Invoice # / Remarks", key=f"{key}_search")
+    with col2:
+        carriers = st.multiselect("Carrier", index.options(df, version, 'Carrier'), key=f"{key}_carrier")
+    statuses = []
+    if status_filter:
+        with col3:
+            statuses = st.multiselect("Status", index.options(df, version, 'Status'), key=f"{key}_status")
+
+    query = query.strip()
+    if 0 < len(query) < GRAM_SIZE:
+        st.caption(f"Type at least {GRAM_SIZE} characters to search.")
+        query = ''
+
+    filters = {'Carrier': carriers, 'Status': statuses}
+    if not query and not any(filters.values()):
+        return shown
+
+    matched = df.iloc[index.lookup(df, version, query, filters)]
+    if group_by is not None:
+        matched = df[df[group_by].isin(matched[group_by])]
+    result = shown[shown.index.isin(matched.index)]
+    st.caption(f"{len(result)} of {len(shown)} record(s) match")
+    return result
@@ -0,0 +1,13 @@
+import os
+import random
+import sys
+
+import pytest
+
+# The app modules live at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def rng():
+    return random.Random(20250601)
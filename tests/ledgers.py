@@ -0,0 +1,41 @@
+"""Ledger builders shared by the payment tests."""
+import pandas as pd
+
+GST_COLUMN = 'GST Amount in INR (If Freight in USD and GST in INR)'
+LEDGER_COLUMNS = [
+    'MBL #', 'Currency', 'Amount', GST_COLUMN, 'Amount Paid Currency',
+    'Amount Paid', 'SWIFT Certificate Link', 'Status'
+]
+STATUSES = [None, 'Paid', 'Pay On: 01-Jan-2025', 'Part Payment: ₹10.0 Pending', 'USD Pending']
+
+
+def ledger_row(mbl, currency, amount, gst=None, paid=None, swift=None, status=None):
+    return {
+        'MBL #': mbl,
+        'Currency': currency,
+        'Amount': amount,
+        GST_COLUMN: gst,
+        'Amount Paid Currency': 'INR' if paid is not None else None,
+        'Amount Paid': paid,
+        'SWIFT Certificate Link': swift,
+        'Status': status,
+    }
+
+
+def ledger(rows):
+    return pd.DataFrame(rows, columns=LEDGER_COLUMNS)
+
+
+def random_ledger(rng, rows, rows_per_mbl=5):
+    """A seeded ledger of whole-rupee amounts with a spread of statuses."""
+    data = []
+    for i in range(rows):
+        currency = rng.choice(['INR', 'INR', 'USD'])
+        gst = float(rng.randint(0, 5000)) if currency == 'USD' and rng.random() < 0.5 else None
+        paid = float(rng.randint(0, 50000)) if rng.random() < 0.5 else None
+        swift = 'https://swift.example/cert' if currency == 'USD' and rng.random() < 0.5 else None
+        data.append(ledger_row(
+            f'MBL{i // rows_per_mbl:07d}', currency, float(rng.randint(1, 50000)),
+            gst, paid, swift, rng.choice(STATUSES)
+        ))
+    return ledger(data)
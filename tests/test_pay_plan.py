@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from payment_planing import unscheduled_rows
+from ledgers import ledger, ledger_row, random_ledger
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def statuses(*values):
+    return ledger([ledger_row(f'M{i}', 'INR', 100.0, status=value) for i, value in enumerate(values)])
+
+
+def test_paid_and_scheduled_rows_are_dropped():
+    df = statuses('Paid', 'Pay On: 01-Jun-2025', 'USD Pending', 'Part Payment: ₹10.0 Pending')
+    assert unscheduled_rows(df)['Status'].tolist() == ['USD Pending', 'Part Payment: ₹10.0 Pending']
+
+
+def test_blank_status_is_unscheduled():
+    df = statuses(None, float('nan'), 'Paid')
+    assert unscheduled_rows(df)['MBL #'].tolist() == ['M0', 'M1']
+
+
+def test_only_exact_paid_and_pay_on_prefix_are_dropped():
+    df = statuses('paid', ' Paid', 'Paid ', 'pay on: 01-Jun-2025', 'Scheduled Pay On: 01-Jun-2025')
+    assert len(unscheduled_rows(df)) == 5
+
+
+def test_result_is_an_independent_frame():
+    df = statuses('USD Pending', 'Paid')
+    result = unscheduled_rows(df)
+    result['Amount'] = 0.0
+    assert df['Amount'].tolist() == [100.0, 100.0]
+
+
+def test_generated_ledger_keeps_only_unscheduled(rng):
+    df = random_ledger(rng, 5000)
+    result = unscheduled_rows(df)
+    status = result['Status'].dropna()
+    assert not (status == 'Paid').any()
+    assert not status.str.startswith('Pay On:').any()
+    dropped = df.drop(result.index)['Status']
+    assert ((dropped == 'Paid') | dropped.str.startswith('Pay On:', na=False)).all()
+
+
+# About twice the measured time; best of three runs, as a single
+# millisecond-scale run is at the mercy of the garbage collector
+@pytest.mark.parametrize('rows, budget', [(10_000, 0.01), (100_000, 0.03)])
+def test_unscheduled_rows_within_budget(rng, rows, budget):
+    df = random_ledger(rng, rows)
+    elapsed = min(timed(unscheduled_rows, df) for _ in range(3))
+    assert elapsed < budget, f'{rows} rows filtered in {elapsed:.2f}s (budget {budget}s)'
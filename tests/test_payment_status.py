@@ -0,0 +1,287 @@
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from financerole import apply_payments, payment_status
+from ledgers import GST_COLUMN, ledger, ledger_row, random_ledger
+
+TODAY = date(2025, 6, 1)
+SWIFT = 'https://swift.example/cert'
+
+
+def status_of(*rows):
+    return payment_status(ledger(list(rows)), TODAY)
+
+
+# ---------- Status outcomes ----------
+
+def test_inr_paid_in_full():
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.0, paid=600.0),
+        ledger_row('M1', 'INR', 500.0, paid=900.0),
+    ) == ('Paid', TODAY)
+
+
+def test_usd_line_without_swift_is_usd_pending():
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.0, paid=1000.0),
+        ledger_row('M1', 'USD', 250.0),
+    ) == ('USD Pending', TODAY)
+
+
+def test_usd_line_with_swift_is_paid():
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.0, paid=1000.0),
+        ledger_row('M1', 'USD', 250.0, swift=SWIFT),
+    ) == ('Paid', TODAY)
+
+
+def test_blank_swift_link_does_not_count_as_usd_payment():
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.0, paid=1000.0),
+        ledger_row('M1', 'USD', 250.0, swift='   '),
+    ) == ('USD Pending', TODAY)
+
+
+def test_part_payment():
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.0, paid=400.0),
+    ) == ('Part Payment: ₹600.0 Pending', TODAY)
+
+
+def test_part_payment_with_usd_pending():
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.0, paid=400.0),
+        ledger_row('M1', 'USD', 250.0),
+    ) == ('Part Payment: ₹600.0 Pending | USD Pending', TODAY)
+
+
+def test_part_payment_with_usd_paid():
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.0, paid=400.0),
+        ledger_row('M1', 'USD', 250.0, swift=SWIFT),
+    ) == ('Part Payment: ₹600.0 Pending', TODAY)
+
+
+def test_over_paid():
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.0, paid=1000.5),
+    ) == ('Over Paid: Check Amount', TODAY)
+
+
+def test_nothing_paid_keeps_last_status_without_date():
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.0, status='Pay On: 01-Jun-2025'),
+        ledger_row('M1', 'INR', 500.0, status='Pay On: 02-Jun-2025'),
+    ) == ('Pay On: 02-Jun-2025', None)
+
+
+def test_non_inr_payments_are_ignored():
+    row = ledger_row('M1', 'INR', 1000.0, paid=1000.0, status='Pay On: 01-Jun-2025')
+    row['Amount Paid Currency'] = 'USD'
+    assert status_of(row) == ('Pay On: 01-Jun-2025', None)
+
+
+# ---------- GST in INR on USD lines ----------
+
+def test_gst_on_usd_line_is_expected_in_inr():
+    assert status_of(
+        ledger_row('M1', 'USD', 250.0, gst=180.0, paid=180.0, swift=SWIFT),
+    ) == ('Paid', TODAY)
+
+
+def test_gst_on_usd_line_adds_to_inr_shortfall():
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.0, paid=1000.0),
+        ledger_row('M1', 'USD', 250.0, gst=180.0),
+    ) == ('Part Payment: ₹180.0 Pending | USD Pending', TODAY)
+
+
+def test_gst_column_is_also_added_on_inr_lines():
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.0, gst=180.0, paid=1000.0),
+    ) == ('Part Payment: ₹180.0 Pending', TODAY)
+
+
+def test_non_numeric_amounts_count_as_zero():
+    assert status_of(
+        ledger_row('M1', 'INR', 'n/a', gst='-', paid=500.0),
+        ledger_row('M1', 'INR', 500.0),
+    ) == ('Paid', TODAY)
+
+
+# ---------- Float equality ----------
+
+def test_float_sum_that_is_not_exact_reads_as_part_payment():
+    # 0.1 + 0.2 != 0.3, so an exact payment is reported as a zero shortfall
+    assert status_of(
+        ledger_row('M1', 'INR', 0.1),
+        ledger_row('M1', 'INR', 0.2, paid=0.3),
+    ) == ('Part Payment: ₹0.0 Pending', TODAY)
+
+
+def test_float_sum_that_is_not_exact_reads_as_over_paid():
+    # 0.1 + 0.7 falls just below 0.8
+    assert status_of(
+        ledger_row('M1', 'INR', 0.1),
+        ledger_row('M1', 'INR', 0.7, paid=0.8),
+    ) == ('Over Paid: Check Amount', TODAY)
+
+
+def test_paid_split_in_the_same_order_matches_exactly():
+    assert status_of(
+        ledger_row('M1', 'INR', 0.1, paid=0.1),
+        ledger_row('M1', 'INR', 0.2, paid=0.2),
+    ) == ('Paid', TODAY)
+
+
+def test_shortfall_is_rounded_to_paise():
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.005, paid=0.001),
+    ) == ('Part Payment: ₹1000.0 Pending', TODAY)
+
+
+def test_missing_inr_payment_amount_falls_through():
+    # NaN is truthy, so `or 0` keeps it and every comparison is False
+    assert status_of(
+        ledger_row('M1', 'INR', 1000.0, paid=float('nan'), status='Pay On: 01-Jun-2025'),
+    ) == ('Pay On: 01-Jun-2025', None)
+
+
+# ---------- Generated ledgers ----------
+
+def generated_mbl(rng):
+    """Rows for one MBL and the status payment_status should report.
+
+    Amounts are whole rupees, so every total is exact in floating point.
+    """
+    rows = [
+        ledger_row('M1', rng.choice(['INR', 'USD']), float(rng.randint(1, 50000)),
+                   gst=float(rng.randint(0, 5000)) if rng.random() < 0.5 else None)
+        for _ in range(rng.randint(1, 6))
+    ]
+    rows[-1]['Status'] = 'Pay On: 01-Jun-2025'
+    expected_inr = sum(
+        (row['Amount'] if row['Currency'] == 'INR' else 0) + (row[GST_COLUMN] or 0)
+        for row in rows
+    )
+
+    usd_lines = any(row['Currency'] == 'USD' for row in rows)
+    if usd_lines and rng.random() < 0.5:
+        next(row for row in rows if row['Currency'] == 'USD')['SWIFT Certificate Link'] = SWIFT
+        usd_pending = False
+    else:
+        usd_pending = usd_lines
+
+    outcome = rng.choice(['paid', 'part', 'over', 'unpaid'])
+    if outcome == 'part' and expected_inr < 2:
+        outcome = 'unpaid'
+    paid = {
+        'paid': expected_inr,
+        'part': float(rng.randint(1, int(expected_inr) - 1)) if outcome == 'part' else None,
+        'over': expected_inr + rng.randint(1, 1000),
+        'unpaid': None,
+    }[outcome]
+    if paid is not None:
+        rows[rng.randrange(len(rows))].update({'Amount Paid Currency': 'INR', 'Amount Paid': paid})
+
+    if outcome == 'paid' or (outcome == 'unpaid' and expected_inr == 0):
+        expected = ('USD Pending' if usd_pending else 'Paid', TODAY)
+    elif outcome == 'part':
+        text = f'Part Payment: ₹{round(expected_inr - paid, 2)} Pending'
+        expected = (text + (' | USD Pending' if usd_pending else ''), TODAY)
+    elif outcome == 'over':
+        expected = ('Over Paid: Check Amount', TODAY)
+    else:
+        expected = ('Pay On: 01-Jun-2025', None)
+    return rows, expected
+
+
+def test_generated_ledgers(rng):
+    for _ in range(500):
+        rows, expected = generated_mbl(rng)
+        assert payment_status(ledger(rows), TODAY) == expected, rows
+
+
+def test_generated_ledgers_status_shape(rng):
+    for _, mbl_rows in random_ledger(rng, 2000).groupby('MBL #', sort=False):
+        status, payment_date = payment_status(mbl_rows, TODAY)
+        if payment_date is None:
+            last_status = mbl_rows['Status'].iloc[-1]
+            assert status == last_status or (pd.isna(status) and pd.isna(last_status))
+        else:
+            assert payment_date == TODAY
+            assert (
+                status in ('Paid', 'USD Pending', 'Over Paid: Check Amount')
+                or status.startswith('Part Payment: ₹')
+            )
+
+
+# ---------- Writing payments back ----------
+
+EDITABLE_COLUMNS = [
+    'Payment Date', 'Payment Reference Number', 'Amount Paid Currency',
+    'Amount Paid', 'Payment Mode', 'SWIFT Certificate Link', 'IRN Required?'
+]
+
+
+def scheduled_batch(df, mbls):
+    """The rows of mbls as the Finance editor hands them back, fully paid in INR."""
+    for col in ['Payment Date', 'Payment Reference Number', 'Payment Mode',
+                'IRN Invoice', 'Payment Updated Date']:
+        df[col] = None
+    batch = df[df['MBL #'].isin(mbls)].copy()
+    batch['Payment Date'] = TODAY
+    batch['Payment Reference Number'] = 'UTR0001'
+    batch['Payment Mode'] = 'NEFT'
+    batch['IRN Required?'] = False
+    batch['Amount Paid Currency'] = 'INR'
+    batch['Amount Paid'] = batch['Amount'].where(batch['Currency'] == 'INR', 0.0)
+    batch['Amount Paid'] += batch[GST_COLUMN].fillna(0)
+    batch['SWIFT Certificate Link'] = SWIFT
+    return batch
+
+
+def test_apply_payments_writes_back_and_restatuses():
+    df = ledger([
+        ledger_row('M1', 'INR', 1000.0, status='Pay On: 01-Jun-2025'),
+        ledger_row('M1', 'USD', 250.0, gst=180.0, status='Pay On: 01-Jun-2025'),
+        ledger_row('M2', 'INR', 500.0, status='Pay On: 02-Jun-2025'),
+    ])
+    batch = scheduled_batch(df, ['M1'])
+    batch.loc[batch['Currency'] == 'INR', 'IRN Required?'] = True
+
+    apply_payments(df, batch, EDITABLE_COLUMNS, TODAY)
+
+    assert df['Status'].tolist() == ['Paid', 'Paid', 'Pay On: 02-Jun-2025']
+    assert df['Payment Updated Date'].tolist()[:2] == [TODAY, TODAY]
+    assert df['Amount Paid'].tolist()[:2] == [1000.0, 180.0]
+    assert df['Payment Reference Number'].tolist() == ['UTR0001', 'UTR0001', None]
+    assert df['IRN Invoice'].tolist() == ['Required', None, None]
+
+
+# ---------- Timing budgets ----------
+
+# About twice the time measured for each operation, so a real regression
+# fails while ordinary machine noise does not
+@pytest.mark.parametrize('rows, budget', [(10_000, 2.5), (100_000, 22.0)])
+def test_reconcile_ledger_within_budget(rng, rows, budget):
+    df = random_ledger(rng, rows)
+    start = time.perf_counter()
+    for _, mbl_rows in df.groupby('MBL #', sort=False):
+        payment_status(mbl_rows, TODAY)
+    elapsed = time.perf_counter() - start
+    assert elapsed < budget, f'{rows} rows reconciled in {elapsed:.2f}s (budget {budget}s)'
+
+
+@pytest.mark.parametrize('rows, budget', [(10_000, 5.0), (100_000, 12.0)])
+def test_apply_payments_within_budget(rng, rows, budget):
+    # A day's schedule of 100 MBLs written back into the whole ledger
+    df = random_ledger(rng, rows)
+    batch = scheduled_batch(df, rng.sample(sorted(df['MBL #'].unique()), 100))
+    start = time.perf_counter()
+    apply_payments(df, batch, EDITABLE_COLUMNS, TODAY)
+    elapsed = time.perf_counter() - start
+    assert elapsed < budget, f'{rows} rows updated in {elapsed:.2f}s (budget {budget}s)'